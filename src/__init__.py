@@ -10,9 +10,10 @@ This package contains:
 __version__ = "1.0.0"
 __author__ = "SRE Team"
 
-from .mcp_datadog_server import DatadogMetricsClient, create_mcp_server
+from .mcp_datadog_server import DatadogMetricsClient, create_mcp_server, render_metric_chart
 
 __all__ = [
     "DatadogMetricsClient",
     "create_mcp_server",
+    "render_metric_chart",
 ]
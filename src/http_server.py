@@ -7,24 +7,41 @@ Useful for integrating with HTTP clients, webhooks, and web services.
 """
 
 import asyncio
-import json
+import hashlib
+import hmac
+import logging
 import os
 import sys
-from typing import Any, Dict, Optional
-
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from enum import StrEnum
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import orjson
 import uvicorn
-from fastapi import FastAPI, HTTPException, Query, Header, Depends
-from fastapi.responses import StreamingResponse, Response
+from cachetools import TTLCache
+from fastapi import FastAPI, HTTPException, Query, Header, Depends, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse, Response
 from dotenv import load_dotenv
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from src.mcp_datadog_server import DatadogMetricsClient
+from src.mcp_datadog_server import (
+    DD_RATE_LIMIT_RPM,
+    DatadogMetricsClient,
+    render_metric_chart,
+    time_range,
+)
 
 # Load environment variables
 load_dotenv(os.path.join(os.path.dirname(__file__), '..', '.env'))
 
+logger = logging.getLogger(__name__)
+
 # Get credentials from environment
 DD_API_KEY = os.getenv("DD_API_KEY")
 DD_APP_KEY = os.getenv("DD_APP_KEY")
@@ -35,10 +52,16 @@ if not DD_API_KEY or not DD_APP_KEY:
     print("ERROR: DD_API_KEY and DD_APP_KEY environment variables are required")
     sys.exit(1)
 
+# Responses to authorized requests must not be stored by shared caches/CDNs,
+# which would serve them to clients without the token
+CACHE_SCOPE = "private" if AUTH_TOKEN else "public"
+
 # Authorization dependency
-def verify_token(authorization: Optional[str] = Header(None)):
-    """Verify authorization token if AUTH_TOKEN is set."""
-    if AUTH_TOKEN:  # Only enforce if token is configured
+if AUTH_TOKEN:
+    AUTH_TOKEN_BYTES = AUTH_TOKEN.encode()
+
+    def verify_token(authorization: Optional[str] = Header(None)):
+        """Verify the Authorization header against MCP_AUTH_TOKEN."""
         if not authorization:
             raise HTTPException(status_code=401, detail="Missing Authorization header")
         
@@ -48,70 +71,414 @@ def verify_token(authorization: Optional[str] = Header(None)):
         else:
             token = authorization
         
-        if token != AUTH_TOKEN:
+        # Constant-time comparison so response timing doesn't leak the token
+        if not hmac.compare_digest(token.encode(), AUTH_TOKEN_BYTES):
             raise HTTPException(status_code=403, detail="Invalid authorization token")
-    
-    return True
+        
+        return True
+else:
+    def verify_token():
+        """Auth is disabled; skip header parsing entirely."""
+        return True
+
+# uvicorn worker processes; the Datadog rate limit budget is split between them
+WORKERS = int(os.getenv("MCP_WORKERS", "1"))
+
+# Initialize Datadog client (one pooled ApiClient for the life of the process)
+client = DatadogMetricsClient(
+    DD_API_KEY,
+    DD_APP_KEY,
+    DD_SITE,
+    rate_limit_rpm=max(1, DD_RATE_LIMIT_RPM // WORKERS) if DD_RATE_LIMIT_RPM > 0 else 0,
+)
+
+
+# Worker processes for CPU-bound chart rendering, started with the app. Each
+# uvicorn worker gets its own pool, so keep it small.
+CHART_WORKERS = int(os.getenv("MCP_CHART_WORKERS", "1"))
+chart_executor: Optional[ProcessPoolExecutor] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start the chart render pool and pre-connect to Datadog; shut down and close connections on exit."""
+    global chart_executor
+    chart_executor = ProcessPoolExecutor(max_workers=CHART_WORKERS)
+    # Pre-connect in the background so a slow network never delays startup
+    threading.Thread(target=client.warm_up, daemon=True).start()
+    yield
+    chart_executor.shutdown(cancel_futures=True)
+    client.close()
+    if redis_cache is not None:
+        await redis_cache.aclose()
+
 
 app = FastAPI(
     title="Datadog MCP HTTP Server",
     description="HTTP wrapper for MCP Datadog Server with Server-Sent Events streaming",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
-# Initialize Datadog client
-client = DatadogMetricsClient(DD_API_KEY, DD_APP_KEY, DD_SITE)
+
+class SSEAwareGZipMiddleware(GZipMiddleware):
+    """GZip responses except SSE streams, where compression would buffer events."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+# Level 1 gets most of the win on repetitive time-series JSON at minimal CPU cost
+app.add_middleware(SSEAwareGZipMiddleware, minimum_size=1024, compresslevel=1)
+
+
+# Hot-path callables bound once to skip global + attribute lookups per request
+_dumps = orjson.dumps
+_loads = orjson.loads
+_now = time.time
+
+
+# Short-lived cache of successful tool results; dashboards repeat the same queries.
+# With REDIS_URL set the cache lives in Redis so all uvicorn workers share hits;
+# if Redis is unreachable, calls fall back to the per-worker in-memory cache.
+RESULT_CACHE_TTL = 60
+REDIS_URL = os.getenv("REDIS_URL")
+
+if REDIS_URL:
+    import redis.asyncio as redis
+    redis_cache = redis.from_url(REDIS_URL)
+else:
+    redis_cache = None
+
+_result_cache: TTLCache = TTLCache(maxsize=1024, ttl=RESULT_CACHE_TTL)
+
+
+def _cache_key(tool: str, params: Dict[str, Any]) -> str:
+    """Build a cache key for a tool call, bucketed to the current minute."""
+    material = _dumps([sorted(params.items()), int(_now()) // 60])
+    return f"dd:{tool}:{hashlib.blake2b(material, digest_size=16).hexdigest()}"
+
+
+async def _cache_get(key: str) -> Optional[dict]:
+    """Look up a cached tool result."""
+    if redis_cache is not None:
+        try:
+            raw = await redis_cache.get(key)
+            return _loads(raw) if raw is not None else None
+        except redis.RedisError as e:
+            logger.warning(f"Redis cache read failed, using in-memory cache: {e}")
+    return _result_cache.get(key)
+
+
+async def _cache_set(key: str, result: dict) -> None:
+    """Store a tool result for RESULT_CACHE_TTL seconds."""
+    if redis_cache is not None:
+        try:
+            await redis_cache.set(key, _dumps(result), ex=RESULT_CACHE_TTL)
+            return
+        except redis.RedisError as e:
+            logger.warning(f"Redis cache write failed, using in-memory cache: {e}")
+    _result_cache[key] = result
+
+
+# Calls currently in flight, so concurrent identical requests share one Datadog query
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+async def _acquire_call_lock(key: str) -> bool:
+    """
+    Claim a call across workers with a short Redis lock. Returns True when this
+    worker should run the call (always, without Redis or if Redis is down).
+    """
+    if redis_cache is None:
+        return True
+    try:
+        return bool(await redis_cache.set(f"{key}:lock", b"1", nx=True, ex=5))
+    except redis.RedisError as e:
+        logger.warning(f"Redis lock failed, running call without it: {e}")
+        return True
+
+
+async def _call_lock_held(key: str) -> bool:
+    """Return whether another worker still holds the call lock for `key`."""
+    try:
+        return bool(await redis_cache.exists(f"{key}:lock"))
+    except redis.RedisError:
+        return False
+
+
+async def _release_call_lock(key: str) -> None:
+    """Drop this worker's call lock so waiting workers stop polling."""
+    if redis_cache is None:
+        return
+    try:
+        await redis_cache.delete(f"{key}:lock")
+    except redis.RedisError as e:
+        logger.warning(f"Redis lock release failed: {e}")
+
+
+async def _fetch(key: str, fn: Callable[..., dict], *args) -> dict:
+    """Run a tool call in a thread and cache its result if it succeeded."""
+    try:
+        owner = await _acquire_call_lock(key)
+        if not owner:
+            # Another worker is already running this call; give it a moment to finish
+            for _ in range(50):
+                await asyncio.sleep(0.1)
+                result = await _cache_get(key)
+                if result is not None:
+                    return result
+                if not await _call_lock_held(key):
+                    # It finished without caching (an error result); run it here.
+                    # Re-check first in case it cached just before unlocking.
+                    result = await _cache_get(key)
+                    if result is not None:
+                        return result
+                    break
+
+        try:
+            result = await asyncio.to_thread(fn, *args)
+            if result.get("status") == "success":
+                await _cache_set(key, result)
+            return result
+        finally:
+            if owner:
+                await _release_call_lock(key)
+    finally:
+        _inflight.pop(key, None)
+
+
+async def cached_call(tool: str, params: Dict[str, Any], fn: Callable[..., dict], *args) -> dict:
+    """
+    Return a cached result for `tool` with `params`, or run `fn(*args)` in a thread.
+
+    Concurrent callers with the same key await a single in-flight call.
+    Only successful results are cached so transient Datadog errors are retried.
+    """
+    key = _cache_key(tool, params)
+    result = await _cache_get(key)
+    if result is not None:
+        return result
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_fetch(key, fn, *args))
+        _inflight[key] = task
+    # Shield so one caller disconnecting doesn't cancel the call for the others
+    return await asyncio.shield(task)
+
+
+# Rendered charts, keyed by a hash that doubles as the response ETag
+CHART_CACHE_TTL = 300
+_chart_cache: TTLCache = TTLCache(maxsize=256, ttl=CHART_CACHE_TTL)
+
+
+def _chart_etag(query: str, days_back: int, title: Optional[str], format: str) -> str:
+    """Build a quoted ETag for a chart, stable within one CHART_CACHE_TTL window."""
+    bucket = int(_now()) // CHART_CACHE_TTL
+    digest = hashlib.blake2b(
+        f"{query}|{days_back}|{bucket}|{title}|{format}".encode(), digest_size=16
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+class Tool(StrEnum):
+    """Tools that can be invoked through /call and /call/stream."""
+    QUERY_METRICS = "query_metrics"
+    SEARCH_METRICS = "search_metrics"
+    GET_METRIC_TAGS = "get_metric_tags"
+
+
+# Client methods bound once so dispatch skips the attribute lookup per request
+_query_metrics = client.query_metrics
+_search_metrics = client.search_metrics
+_get_metric_tags = client.get_metric_tags
+
+
+async def invoke(tool: str, params: Dict[str, Any]) -> dict:
+    """
+    Run a tool by name through the result cache.
+
+    This is the single dispatch site for /call and /call/stream.
+
+    Raises:
+        ValueError: If `tool` is not a known Tool
+    """
+    match tool:
+        case Tool.QUERY_METRICS:
+            query = params.get("query")
+            days_back = params.get("days_back", 7)
+            return await cached_call(
+                Tool.QUERY_METRICS, {"query": query, "days_back": days_back},
+                _query_metrics, query, *time_range(days_back)
+            )
+        case Tool.SEARCH_METRICS:
+            prefix = params.get("prefix")
+            return await cached_call(Tool.SEARCH_METRICS, {"prefix": prefix}, _search_metrics, prefix)
+        case Tool.GET_METRIC_TAGS:
+            metric_name = params.get("metric_name")
+            return await cached_call(
+                Tool.GET_METRIC_TAGS, {"metric_name": metric_name}, _get_metric_tags, metric_name
+            )
+        case _:
+            raise ValueError(f"Unknown tool: {tool}")
+
+
+SSE_MEDIA_TYPE = "text/event-stream"
+# no-transform keeps intermediaries from compressing (and so buffering) the stream
+SSE_HEADERS = {"Cache-Control": "no-cache, no-transform"}
+
+
+def sse_pack(obj: Dict[str, Any]) -> bytes:
+    """Frame a payload as a single SSE `data:` event."""
+    return b"data: " + _dumps(obj) + b"\n\n"
+
+
+def sse_error(message: str) -> bytes:
+    """Frame an SSE `error` event."""
+    return sse_pack({"type": "error", "error": message})
+
+
+# Constant terminal event, encoded once at import
+SSE_COMPLETE = sse_pack({"type": "complete", "status": "success"})
+
+# Keepalive comment so proxies don't drop idle streams while a query runs
+SSE_HEARTBEAT = b": ping\n\n"
+SSE_HEARTBEAT_INTERVAL = 15.0
+SSE_DISCONNECT_POLL = 1.0
+
+
+async def _heartbeat_until_done(request: Request, task: asyncio.Future):
+    """
+    Yield SSE keepalive comments while `task` runs.
+
+    Stops as soon as `task` finishes, or early (leaving it unfinished) if the
+    client has disconnected.
+    """
+    idle = 0.0
+    while not task.done():
+        await asyncio.wait({task}, timeout=SSE_DISCONNECT_POLL)
+        if task.done() or await request.is_disconnected():
+            return
+        idle += SSE_DISCONNECT_POLL
+        if idle >= SSE_HEARTBEAT_INTERVAL:
+            idle = 0.0
+            yield SSE_HEARTBEAT
+
+
+async def stream_tool(
+    request: Request,
+    start_meta: Dict[str, Any],
+    call: Callable[[], Awaitable[dict]],
+    per_series: bool = False,
+):
+    """
+    Stream a tool call as SSE events: start, data, complete (or error).
+
+    While the call runs a `: ping` comment is sent every SSE_HEARTBEAT_INTERVAL
+    seconds. If the client disconnects first, this caller stops waiting; a
+    shared in-flight Datadog query still completes for other waiters.
+
+    Args:
+        request: Incoming request, polled for client disconnects
+        start_meta: Fields echoed back in the `start` event
+        call: Zero-argument coroutine function producing the tool result
+        per_series: Send a successful query_metrics result as a `meta` event
+            (all fields but `series`) followed by one `series` event per
+            series, instead of a single `data` event
+    """
+    task = asyncio.ensure_future(call())
+    try:
+        yield sse_pack({"type": "start", **start_meta})
+        async for heartbeat in _heartbeat_until_done(request, task):
+            yield heartbeat
+        if not task.done():
+            return
+        result = task.result()
+        if per_series and result.get("status") == "success":
+            pack = sse_pack
+            yield pack({"type": "meta", **{k: v for k, v in result.items() if k != "series"}})
+            for series in result["series"]:
+                yield pack({"type": "series", "series": series})
+        else:
+            yield sse_pack({"type": "data", "result": result})
+        yield SSE_COMPLETE
+    except Exception as e:
+        yield sse_error(str(e))
+    finally:
+        task.cancel()
+
+
+# Static payloads served by /health and /tools, encoded once with a content ETag
+HEALTH_BYTES = orjson.dumps({
+    "status": "healthy",
+    "service": "datadog-mcp-http",
+    "version": "1.0.0",
+    "auth_required": bool(AUTH_TOKEN)
+})
+HEALTH_ETAG = f'"{hashlib.blake2b(HEALTH_BYTES, digest_size=8).hexdigest()}"'
+
+TOOLS_BYTES = orjson.dumps({
+    "tools": [
+        {
+            "name": "query_metrics",
+            "description": "Query Datadog metrics with time-series data",
+            "parameters": {
+                "query": {"type": "string", "description": "Datadog metric query"},
+                "days_back": {"type": "integer", "description": "Days to look back (default: 7)"}
+            }
+        },
+        {
+            "name": "search_metrics",
+            "description": "Search for available metrics by prefix",
+            "parameters": {
+                "prefix": {"type": "string", "description": "Metric prefix to search"}
+            }
+        },
+        {
+            "name": "get_metric_tags",
+            "description": "Get tag information for a metric",
+            "parameters": {
+                "metric_name": {"type": "string", "description": "Full metric name"}
+            }
+        },
+        {
+            "name": "generate_metric_chart",
+            "description": "Generate a PNG chart image for metrics",
+            "parameters": {
+                "query": {"type": "string", "description": "Datadog metric query"},
+                "days_back": {"type": "integer", "description": "Days to look back (default: 7)"},
+                "title": {"type": "string", "description": "Chart title (optional)"}
+            }
+        }
+    ]
+})
+TOOLS_ETAG = f'"{hashlib.blake2b(TOOLS_BYTES, digest_size=8).hexdigest()}"'
+
+
+def _static_json(request: Request, body: bytes, etag: str, cache_control: str) -> Response:
+    """Serve pre-encoded JSON, or an empty 304 if the client's If-None-Match matches."""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
 
 
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint (no auth required)."""
-    return {
-        "status": "healthy",
-        "service": "datadog-mcp-http",
-        "version": "1.0.0",
-        "auth_required": bool(AUTH_TOKEN)
-    }
+    # no-cache: clients must revalidate, so a 304 still proves the server is up
+    return _static_json(request, HEALTH_BYTES, HEALTH_ETAG, "no-cache")
 
 
 @app.get("/tools")
-async def list_tools(authorized: bool = Depends(verify_token)):
+async def list_tools(request: Request, authorized: bool = Depends(verify_token)):
     """List available MCP tools."""
-    return {
-        "tools": [
-            {
-                "name": "query_metrics",
-                "description": "Query Datadog metrics with time-series data",
-                "parameters": {
-                    "query": {"type": "string", "description": "Datadog metric query"},
-                    "days_back": {"type": "integer", "description": "Days to look back (default: 7)"}
-                }
-            },
-            {
-                "name": "search_metrics",
-                "description": "Search for available metrics by prefix",
-                "parameters": {
-                    "prefix": {"type": "string", "description": "Metric prefix to search"}
-                }
-            },
-            {
-                "name": "get_metric_tags",
-                "description": "Get tag information for a metric",
-                "parameters": {
-                    "metric_name": {"type": "string", "description": "Full metric name"}
-                }
-            },
-            {
-                "name": "generate_metric_chart",
-                "description": "Generate a PNG chart image for metrics",
-                "parameters": {
-                    "query": {"type": "string", "description": "Datadog metric query"},
-                    "days_back": {"type": "integer", "description": "Days to look back (default: 7)"},
-                    "title": {"type": "string", "description": "Chart title (optional)"}
-                }
-            }
-        ]
-    }
+    return _static_json(request, TOOLS_BYTES, TOOLS_ETAG, f"{CACHE_SCOPE}, max-age=3600")
 
 
 @app.get("/query_metrics")
@@ -126,12 +493,12 @@ async def query_metrics_endpoint(
     Example: /query_metrics?query=avg:system.cpu.user{*}&days_back=7
     """
     try:
-        result = client.query_metrics(query, days_back)
+        result = await invoke(Tool.QUERY_METRICS, {"query": query, "days_back": days_back})
         return {
             "status": "success",
             "tool": "query_metrics",
             "parameters": {"query": query, "days_back": days_back},
-            "result": json.loads(result) if isinstance(result, str) else result
+            "result": result
         }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -139,33 +506,29 @@ async def query_metrics_endpoint(
 
 @app.get("/query_metrics/stream")
 async def query_metrics_stream(
+    request: Request,
     query: str = Query(..., description="Datadog metric query"),
     days_back: int = Query(7, description="Days to look back"),
     authorized: bool = Depends(verify_token)
 ):
     """
     Query Datadog metrics with SSE (Server-Sent Events) streaming.
+
+    Each series is sent as its own `series` event so clients can start
+    rendering before the whole result has arrived.
     
     Example: /query_metrics/stream?query=avg:system.cpu.user{*}&days_back=7
     """
-    async def generate():
-        try:
-            # Send query details
-            yield f"data: {json.dumps({'type': 'start', 'query': query, 'days_back': days_back})}\n\n"
-            
-            # Query metrics
-            result = client.query_metrics(query, days_back)
-            result_data = json.loads(result) if isinstance(result, str) else result
-            
-            # Send result
-            yield f"data: {json.dumps({'type': 'data', 'result': result_data})}\n\n"
-            
-            # Send complete
-            yield f"data: {json.dumps({'type': 'complete', 'status': 'success'})}\n\n"
-        except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
-    
-    return StreamingResponse(generate(), media_type="text/event-stream")
+    return StreamingResponse(
+        stream_tool(
+            request,
+            {"query": query, "days_back": days_back},
+            lambda: invoke(Tool.QUERY_METRICS, {"query": query, "days_back": days_back}),
+            per_series=True,
+        ),
+        media_type=SSE_MEDIA_TYPE,
+        headers=SSE_HEADERS
+    )
 
 
 @app.get("/search_metrics")
@@ -179,12 +542,12 @@ async def search_metrics_endpoint(
     Example: /search_metrics?prefix=system
     """
     try:
-        result = client.search_metrics(prefix)
+        result = await invoke(Tool.SEARCH_METRICS, {"prefix": prefix})
         return {
             "status": "success",
             "tool": "search_metrics",
             "parameters": {"prefix": prefix},
-            "result": json.loads(result) if isinstance(result, str) else result
+            "result": result
         }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -192,6 +555,7 @@ async def search_metrics_endpoint(
 
 @app.get("/search_metrics/stream")
 async def search_metrics_stream(
+    request: Request,
     prefix: str = Query(..., description="Metric prefix"),
     authorized: bool = Depends(verify_token)
 ):
@@ -200,19 +564,15 @@ async def search_metrics_stream(
     
     Example: /search_metrics/stream?prefix=system
     """
-    async def generate():
-        try:
-            yield f"data: {json.dumps({'type': 'start', 'prefix': prefix})}\n\n"
-            
-            result = client.search_metrics(prefix)
-            result_data = json.loads(result) if isinstance(result, str) else result
-            
-            yield f"data: {json.dumps({'type': 'data', 'result': result_data})}\n\n"
-            yield f"data: {json.dumps({'type': 'complete', 'status': 'success'})}\n\n"
-        except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
-    
-    return StreamingResponse(generate(), media_type="text/event-stream")
+    return StreamingResponse(
+        stream_tool(
+            request,
+            {"prefix": prefix},
+            lambda: invoke(Tool.SEARCH_METRICS, {"prefix": prefix}),
+        ),
+        media_type=SSE_MEDIA_TYPE,
+        headers=SSE_HEADERS
+    )
 
 
 @app.get("/get_metric_tags")
@@ -226,12 +586,12 @@ async def get_metric_tags_endpoint(
     Example: /get_metric_tags?metric_name=system.cpu.user
     """
     try:
-        result = client.get_metric_tags(metric_name)
+        result = await invoke(Tool.GET_METRIC_TAGS, {"metric_name": metric_name})
         return {
             "status": "success",
             "tool": "get_metric_tags",
             "parameters": {"metric_name": metric_name},
-            "result": json.loads(result) if isinstance(result, str) else result
+            "result": result
         }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -239,6 +599,7 @@ async def get_metric_tags_endpoint(
 
 @app.get("/get_metric_tags/stream")
 async def get_metric_tags_stream(
+    request: Request,
     metric_name: str = Query(..., description="Metric name"),
     authorized: bool = Depends(verify_token)
 ):
@@ -247,23 +608,30 @@ async def get_metric_tags_stream(
     
     Example: /get_metric_tags/stream?metric_name=system.cpu.user
     """
-    async def generate():
-        try:
-            yield f"data: {json.dumps({'type': 'start', 'metric_name': metric_name})}\n\n"
-            
-            result = client.get_metric_tags(metric_name)
-            result_data = json.loads(result) if isinstance(result, str) else result
-            
-            yield f"data: {json.dumps({'type': 'data', 'result': result_data})}\n\n"
-            yield f"data: {json.dumps({'type': 'complete', 'status': 'success'})}\n\n"
-        except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
-    
-    return StreamingResponse(generate(), media_type="text/event-stream")
+    return StreamingResponse(
+        stream_tool(
+            request,
+            {"metric_name": metric_name},
+            lambda: invoke(Tool.GET_METRIC_TAGS, {"metric_name": metric_name}),
+        ),
+        media_type=SSE_MEDIA_TYPE,
+        headers=SSE_HEADERS
+    )
+
+
+async def _read_call_body(request: Request) -> Dict[str, Any]:
+    """Parse a /call request body with orjson, bypassing FastAPI's body validation."""
+    try:
+        payload = _loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Request body must be valid JSON")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Request body must be a JSON object")
+    return payload
 
 
 @app.post("/call")
-async def call_tool(request: Dict[str, Any], authorized: bool = Depends(verify_token)):
+async def call_tool(request: Request, authorized: bool = Depends(verify_token)):
     """
     Universal endpoint to call any MCP tool.
     
@@ -278,104 +646,100 @@ async def call_tool(request: Dict[str, Any], authorized: bool = Depends(verify_t
     }
     ```
     """
+    payload = await _read_call_body(request)
     try:
-        tool_name = request.get("tool")
-        parameters = request.get("parameters", {})
+        tool_name = payload.get("tool")
+        parameters = payload.get("parameters", {})
         
-        if tool_name == "query_metrics":
-            result = client.query_metrics(
-                parameters.get("query"),
-                parameters.get("days_back", 7)
-            )
-        elif tool_name == "search_metrics":
-            result = client.search_metrics(parameters.get("prefix"))
-        elif tool_name == "get_metric_tags":
-            result = client.get_metric_tags(parameters.get("metric_name"))
-        else:
-            raise HTTPException(status_code=400, detail=f"Unknown tool: {tool_name}")
+        result = await invoke(tool_name, parameters)
         
         return {
             "status": "success",
             "tool": tool_name,
             "parameters": parameters,
-            "result": json.loads(result) if isinstance(result, str) else result
+            "result": result
         }
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.post("/call/stream")
-async def call_tool_stream(request: Dict[str, Any], authorized: bool = Depends(verify_token)):
+async def call_tool_stream(request: Request, authorized: bool = Depends(verify_token)):
     """
     Universal endpoint with SSE streaming.
     
     Same as /call but streams the response.
     """
-    async def generate():
-        try:
-            tool_name = request.get("tool")
-            parameters = request.get("parameters", {})
-            
-            yield f"data: {json.dumps({'type': 'start', 'tool': tool_name, 'parameters': parameters})}\n\n"
-            
-            if tool_name == "query_metrics":
-                result = client.query_metrics(
-                    parameters.get("query"),
-                    parameters.get("days_back", 7)
-                )
-            elif tool_name == "search_metrics":
-                result = client.search_metrics(parameters.get("prefix"))
-            elif tool_name == "get_metric_tags":
-                result = client.get_metric_tags(parameters.get("metric_name"))
-            else:
-                raise Exception(f"Unknown tool: {tool_name}")
-            
-            result_data = json.loads(result) if isinstance(result, str) else result
-            
-            yield f"data: {json.dumps({'type': 'data', 'result': result_data})}\n\n"
-            yield f"data: {json.dumps({'type': 'complete', 'status': 'success'})}\n\n"
-        except Exception as e:
-            yield f"data: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
-    
-    return StreamingResponse(generate(), media_type="text/event-stream")
+    payload = await _read_call_body(request)
+    tool_name = payload.get("tool")
+    parameters = payload.get("parameters", {})
+
+    return StreamingResponse(
+        stream_tool(
+            request, {"tool": tool_name, "parameters": parameters}, lambda: invoke(tool_name, parameters)
+        ),
+        media_type=SSE_MEDIA_TYPE,
+        headers=SSE_HEADERS
+    )
 
 
 @app.get("/generate_metric_chart")
 async def generate_chart_endpoint(
+    request: Request,
     query: str = Query(..., description="Datadog metric query"),
     days_back: int = Query(7, description="Days to look back"),
     title: str = Query(None, description="Chart title"),
-    format: str = Query("png", description="Output format: png or base64"),
+    format: str = Query("png", description="Output format: png, svg or base64"),
     authorized: bool = Depends(verify_token)
 ):
     """
     Generate a chart image for Datadog metrics.
+
+    Rendered charts are cached for CHART_CACHE_TTL seconds and served with an
+    ETag; a matching If-None-Match header gets an empty 304 response.
     
     Example: /generate_metric_chart?query=avg:system.cpu.user{*}&days_back=7&format=png
     """
     try:
-        import time
-        to_ts = int(time.time())
-        from_ts = to_ts - days_back * 24 * 3600
-        
-        result = client.generate_metric_image(query, from_ts, to_ts, title, format=format)
-        
-        if result.get("status") != "success":
-            raise HTTPException(status_code=400, detail=result.get("error", "Failed to generate image"))
+        etag = _chart_etag(query, days_back, title, format)
+        cache_headers = {"ETag": etag, "Cache-Control": f"{CACHE_SCOPE}, max-age={CHART_CACHE_TTL}"}
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=cache_headers)
+
+        result = _chart_cache.get(etag)
+        if result is None:
+            data = await invoke(Tool.QUERY_METRICS, {"query": query, "days_back": days_back})
+            if data.get("status") != "success" or not data.get("series"):
+                raise HTTPException(status_code=400, detail=data.get("error", "No data available for the query"))
+            
+            # Rendering is CPU-bound and holds the GIL; run it in a worker process
+            result = await asyncio.get_running_loop().run_in_executor(
+                chart_executor, render_metric_chart, data["series"], query, title, format
+            )
+            
+            if result.get("status") != "success":
+                raise HTTPException(status_code=400, detail=result.get("error", "Failed to generate image"))
+            _chart_cache[etag] = result
         
         if format == "base64":
-            return {
-                "status": "success",
-                "tool": "generate_metric_chart",
-                "parameters": {"query": query, "days_back": days_back, "title": title},
-                "result": result
-            }
+            return ORJSONResponse(
+                {
+                    "status": "success",
+                    "tool": "generate_metric_chart",
+                    "parameters": {"query": query, "days_back": days_back, "title": title},
+                    "result": result
+                },
+                headers=cache_headers
+            )
         else:
-            # Return PNG image directly
+            # Return PNG/SVG image directly
             return Response(
                 content=result["image_bytes"],
-                media_type="image/png",
-                headers={"Content-Disposition": f'inline; filename="metric_chart.png"'}
+                media_type=result["mime_type"],
+                headers={
+                    "Content-Disposition": f'inline; filename="metric_chart.{result["format"]}"',
+                    **cache_headers,
+                }
             )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -408,7 +772,7 @@ if __name__ == "__main__":
        GET  /get_metric_tags           - Get metric tags (JSON response)
        GET  /get_metric_tags/stream    - Get metric tags (SSE streaming)
        
-       GET  /generate_metric_chart     - Generate chart image (PNG/base64)
+       GET  /generate_metric_chart     - Generate chart image (PNG/SVG/base64)
        
        POST /call                      - Call any tool (JSON response)
        POST /call/stream               - Call any tool (SSE streaming)
@@ -417,6 +781,10 @@ if __name__ == "__main__":
        DD_API_KEY=your-api-key
        DD_APP_KEY=your-app-key
     
+    ⚙️  Optional Tuning:
+       MCP_WORKERS=N (uvicorn worker processes, default: 1)
+       MCP_CHART_WORKERS=N (chart render processes per worker, default: 1)
+    
     🔐 Optional Authorization:
        MCP_AUTH_TOKEN=your-secret-token
        (If set, requires: Authorization: Bearer your-secret-token)
@@ -427,5 +795,9 @@ if __name__ == "__main__":
         "src.http_server:app",
         host="0.0.0.0",
         port=port,
-        reload=False
+        reload=False,
+        loop="uvloop",
+        http="httptools",
+        workers=WORKERS,
+        log_level="warning"
     )
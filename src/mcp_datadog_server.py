@@ -13,33 +13,43 @@ Environment Variables:
   DD_API_KEY: Datadog API key
   DD_APP_KEY: Datadog Application key
   DD_SITE: Datadog site (default: datadoghq.com)
+  DD_CACHE_MODE: Query result cache, 'enabled' (default) or 'disabled'
+  DD_RATE_LIMIT_RPM: Client-side cap on Datadog API calls per minute
+    (default: 60, 0 disables)
+  MCP_PRETTY_JSON: Set to 1 to indent tool results (default: compact JSON)
 """
 
+import asyncio
 import os
 import sys
-import json
 import time
-import io
-import base64
-from typing import Any
-from datetime import datetime
+import hashlib
+import threading
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from types import SimpleNamespace
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Optional
 import logging
 
+import httpx
+from cachetools import TLRUCache
+import numpy as np
+import orjson
+
 # MCP imports
 from mcp.server.fastmcp import FastMCP
 import mcp.types as types
 
 # Datadog imports
+from datadog_api_client import rest
 from datadog_api_client.v1 import ApiClient, Configuration
 from datadog_api_client.v1.api.metrics_api import MetricsApi
 from datadog_api_client.v1.api.tags_api import TagsApi
+from datadog_api_client.v1.model.metric_search_response_results import MetricSearchResponseResults
 
-# Image generation
-import matplotlib
-matplotlib.use('Agg')  # Non-interactive backend
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from PIL import Image
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -50,24 +60,313 @@ logger = logging.getLogger(__name__)
 # Datadog Client Initialization
 # =============================================================================
 
+# Query result cache: windows ending within the last hour may still change
+# (recent points, late-arriving data); older windows are effectively immutable.
+CACHE_TTL_RECENT = 60
+CACHE_TTL_HISTORICAL = 3600
+CACHE_MAXSIZE = 512
+
+
+def _cache_ttu(_key: str, entry: tuple[int, dict[str, Any]], now: float) -> float:
+    """Expiry time for a (ttl, result) cache entry."""
+    return now + entry[0]
+
+
+# Max metric names returned by search_metrics. /api/v1/search has no limit or
+# paging parameter, so the cap is applied while extracting names instead.
+SEARCH_METRICS_LIMIT = 50
+
+# Client-side API call budget; calls beyond it wait locally instead of
+# drawing 429s and SDK retry backoff from Datadog. The default matches the
+# 3600 requests/hour query limit.
+DD_RATE_LIMIT_RPM = int(os.getenv("DD_RATE_LIMIT_RPM", "60"))
+
+def _decode_points(ts_ms: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Decode raw point arrays into (timestamps_s, values).
+
+    Timestamps go from milliseconds to int64 seconds, missing values (NaN)
+    become 0.0, and empty (0, 0.0) points are dropped.
+    """
+    ts = (np.nan_to_num(ts_ms, nan=0.0) / 1000.0).astype(np.int64)
+    values = np.nan_to_num(values, nan=0.0)
+    mask = (ts > 0) | (values != 0.0)
+    return ts[mask], values[mask]
+
+
+def _to_float(field: Any) -> float:
+    """Convert one point field to float; NaN if null or unreadable."""
+    try:
+        return float(field) if field is not None else np.nan
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _point_pair(point: Any) -> tuple[float, float]:
+    """Read (timestamp_ms, value) from a point given as a pair or an object."""
+    try:
+        ts, value = point[0], point[1]
+    except (TypeError, KeyError, IndexError, AttributeError):
+        ts, value = getattr(point, "timestamp", None), getattr(point, "value", None)
+    return _to_float(ts), _to_float(value)
+
+
+def _point_arrays(pointlist: list) -> tuple[np.ndarray, np.ndarray]:
+    """Split a pointlist into raw (timestamp_ms, value) float arrays."""
+    first = pointlist[0]
+    try:
+        if isinstance(getattr(first, "value", None), list):
+            # The SDK wraps each [timestamp_ms, value] pair in a Point model's .value
+            pairs = [p.value for p in pointlist]
+        elif hasattr(first, "timestamp") and hasattr(first, "value"):
+            # Point objects: gather both fields in one pass, convert in bulk
+            pairs = [(p.timestamp, p.value) for p in pointlist]
+        else:
+            pairs = pointlist
+        arr = np.asarray(pairs, dtype=np.float64)
+        if arr.ndim == 2 and arr.shape[1] >= 2:
+            return arr[:, 0], arr[:, 1]
+    except (TypeError, ValueError, AttributeError):
+        pass
+    # Ragged or mixed pointlists: decode point by point, still in one pass
+    arr = np.array([_point_pair(p) for p in pointlist], dtype=np.float64).reshape(-1, 2)
+    return arr[:, 0], arr[:, 1]
+
+
+def _series_arrays(response: Any) -> list[tuple[str, np.ndarray, np.ndarray]]:
+    """
+    Decode a MetricsQueryResponse (or its raw JSON dict) into
+    (scope, timestamps_s, values) arrays, one per series that has data.
+    """
+    raw = isinstance(response, dict)
+    decoded = []
+    if series := (response.get("series") if raw else response.series):
+        for s in series:
+            if raw:
+                scope = s.get("scope") or ""
+                pointlist = s.get("pointlist") or []
+            else:
+                scope = getattr(s, "scope", None) or ""
+                pointlist = getattr(s, "pointlist", None) or []
+            
+            if not pointlist:
+                continue
+            timestamps, values = _decode_points(*_point_arrays(pointlist))
+            
+            if len(timestamps):  # Only add series if it has data
+                decoded.append((scope, timestamps, values))
+    return decoded
+
+
+def _format_query_response(
+    series: list[tuple[str, np.ndarray, np.ndarray]],
+    query: str,
+    from_timestamp: int,
+    to_timestamp: int,
+) -> dict[str, Any]:
+    """Build the query_metrics result dict from decoded series arrays."""
+    series_list = [
+        {"scope": scope, "timestamps": timestamps.tolist(), "values": values.tolist()}
+        for scope, timestamps, values in series
+    ]
+    return {
+        "status": "success",
+        "query": query,
+        "from": from_timestamp,
+        "to": to_timestamp,
+        "series_count": len(series_list),
+        "series": series_list,
+    }
+
+
+def _metric_name_extractor(results: Any) -> Callable[[Any], Iterator[str]]:
+    """
+    Pick how to read metric names out of list_metrics results, from their shape.
+
+    Called once per client; the returned extractor is then reused so searches
+    skip per-element shape probing.
+    """
+    if isinstance(results, MetricSearchResponseResults):
+        # .metrics is a list of metric names; reading it unset raises, so use get()
+        return lambda r: iter(r.get("metrics") or ())
+    if hasattr(results, "results"):
+        return lambda r: (m.name for m in r.results)
+    first = next(iter(results), None)
+    if first is None or isinstance(first, str):
+        return iter
+    return lambda r: (m.name for m in r)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket allowing `rpm` calls per minute, bursting to `rpm`.
+
+    Each acquire reserves its tokens immediately, letting the balance go
+    negative, and the caller then sleeps off the deficit. Waiters are thus
+    served in arrival order without holding the lock while sleeping.
+    """
+
+    def __init__(self, rpm: int):
+        self.capacity = float(rpm)
+        self.rate = rpm / 60.0  # tokens per second
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: int) -> float:
+        """Take `tokens` from the bucket and return how long to wait for them."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._last
+            self._last = now
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: int = 1) -> None:
+        """Block the calling thread until `tokens` are available."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int = 1) -> None:
+        """Wait for `tokens` without blocking the event loop."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class PooledApiClient(ApiClient):
+    """
+    ApiClient whose urllib3 pool keeps up to `maxsize` connections per host.
+
+    The stock ApiClient builds its REST client with urllib3's default of 4,
+    which makes concurrent threaded calls open and discard extra connections.
+    """
+
+    def __init__(self, configuration: Configuration, maxsize: int):
+        self.pool_maxsize = maxsize
+        super().__init__(configuration)
+
+    def _build_rest_client(self):
+        return rest.RESTClientObject(self.configuration, maxsize=self.pool_maxsize)
+
+
+@lru_cache(maxsize=4)
+def _build_client(api_key: str, app_key: str, site: str, pool_maxsize: int) -> PooledApiClient:
+    """
+    Build a configured ApiClient, shared by every DatadogMetricsClient with the
+    same credentials and site so repeated construction reuses its pool.
+    """
+    config = Configuration()
+    config.api_key["apiKeyAuth"] = api_key
+    config.api_key["appKeyAuth"] = app_key
+    config.server_variables["site"] = site
+    return PooledApiClient(config, pool_maxsize)
+
+
 class DatadogMetricsClient:
     """Wrapper around Datadog API client for metrics operations."""
 
-    def __init__(self, api_key: str, app_key: str, site: str = "datadoghq.com"):
-        """Initialize Datadog API client."""
+    def __init__(
+        self,
+        api_key: str,
+        app_key: str,
+        site: str = "datadoghq.com",
+        pool_maxsize: int = 50,
+        cache_mode: Optional[str] = None,
+        rate_limit_rpm: Optional[int] = None,
+    ):
+        """
+        Initialize Datadog API client.
+
+        A single ApiClient (and its urllib3 connection pool) is shared by every
+        call made through this instance, and by other instances built with the
+        same credentials and site, so TLS connections are reused.
+
+        Args:
+            cache_mode: 'enabled' or 'disabled' query result caching
+                (default: DD_CACHE_MODE env var, else 'enabled')
+            rate_limit_rpm: Max Datadog API calls per minute, 0 for no limit
+                (default: DD_RATE_LIMIT_RPM env var, else 60)
+        """
         self.api_key = api_key
         self.app_key = app_key
         self.site = site
 
-        config = Configuration()
-        config.api_key["apiKeyAuth"] = api_key
-        config.api_key["appKeyAuth"] = app_key
-        config.server_variables["site"] = site
+        cache_mode = (cache_mode or os.getenv("DD_CACHE_MODE", "enabled")).lower()
+        self.cache_enabled = cache_mode != "disabled"
+        # Expired entries are swept on every insert, so stale minute-bucket
+        # keys don't accumulate until maxsize
+        self._cache: TLRUCache = TLRUCache(maxsize=CACHE_MAXSIZE, ttu=_cache_ttu)
+        self._cache_lock = threading.Lock()
+        # Set by the first search_metrics call that gets results
+        self._metric_names: Optional[Callable[[Any], Iterator[str]]] = None
 
-        self.api_client = ApiClient(config)
+        if rate_limit_rpm is None:
+            rate_limit_rpm = DD_RATE_LIMIT_RPM
+        self._bucket = TokenBucket(rate_limit_rpm) if rate_limit_rpm > 0 else None
+
+        self.api_client = _build_client(api_key, app_key, site, pool_maxsize)
+        self.config = self.api_client.configuration
         self.metrics_api = MetricsApi(self.api_client)
         self.tags_api = TagsApi(self.api_client)
 
+        # HTTP/2 client for batched queries, created on first use
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+    def close(self) -> None:
+        """Release pooled HTTP connections (the pool reconnects if used again)."""
+        self.api_client.close()
+
+    def warm_up(self) -> None:
+        """
+        Open one idle connection to the Datadog API host so the first query
+        skips the TCP and TLS handshake. Best effort: failures are only logged.
+        """
+        try:
+            pool = self.api_client.rest_client.pool_manager.connection_from_url(self.config.host)
+            # urllib3 has no public way to open an idle pooled connection without
+            # sending a request. _get_conn/_put_conn have been stable across 1.x
+            # and 2.x, and if they ever change this only logs a warning below.
+            conn = pool._get_conn()
+            conn.connect()
+            pool._put_conn(conn)
+        except Exception as e:
+            logger.warning(f"Could not pre-connect to {self.config.host}: {e}")
+
+    def _acquire(self) -> None:
+        """Wait for a rate limit token before an API call."""
+        if self._bucket is not None:
+            self._bucket.acquire(1)
+
+    async def _acquire_async(self) -> None:
+        """Async variant of _acquire."""
+        if self._bucket is not None:
+            await self._bucket.acquire_async(1)
+
+    def _cache_key(self, query: str, from_timestamp: int, to_timestamp: int) -> str:
+        """Hash a query and its time range, bucketed to the minute."""
+        raw = f"{query}|{from_timestamp // 60}|{to_timestamp // 60}|{self.site}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _cache_get(self, key: str) -> Optional[dict[str, Any]]:
+        """Return a cached result, or None if missing or expired."""
+        with self._cache_lock:
+            entry = self._cache.get(key)
+        return entry[1] if entry is not None else None
+
+    def _cache_put(self, key: str, result: dict[str, Any], to_timestamp: int) -> None:
+        """Cache a result, keeping historical windows longer than recent ones."""
+        if to_timestamp < time.time() - CACHE_TTL_HISTORICAL:
+            ttl = CACHE_TTL_HISTORICAL
+        else:
+            ttl = CACHE_TTL_RECENT
+        with self._cache_lock:
+            self._cache[key] = (ttl, result)
+
     def query_metrics(
         self,
         query: str,
@@ -77,6 +376,9 @@ class DatadogMetricsClient:
         """
         Query timeseries metrics from Datadog.
 
+        Successful results are cached per (query, from, to, site), with the
+        time range bucketed to the minute, unless caching is disabled.
+
         Args:
             query: Datadog metric query (e.g., "avg:system.cpu{*}")
             from_timestamp: Start time (unix seconds)
@@ -85,48 +387,77 @@ class DatadogMetricsClient:
         Returns:
             Dictionary with series data and metadata
         """
-        try:
-            response = self.metrics_api.query_metrics(
-                _from=from_timestamp,
-                to=to_timestamp,
-                query=query,
-            )
+        if not self.cache_enabled:
+            return self._fetch_metrics(query, from_timestamp, to_timestamp)
 
-            series_list = []
-            if response.series:
-                for s in response.series:
-                    scope = getattr(s, "scope", None) or ""
-                    pointlist = getattr(s, "pointlist", None) or []
-                    
-                    # Convert points to [timestamp, value] format
-                    points = []
-                    for p in pointlist:
-                        try:
-                            # Try list access first
-                            ts = int(p[0] / 1000) if p[0] else 0
-                            val = float(p[1]) if p[1] is not None else 0.0
-                            points.append([ts, val])
-                        except (TypeError, KeyError, IndexError):
-                            # Fallback: try as object attributes
-                            try:
-                                ts = int(getattr(p, 'timestamp', 0) / 1000)
-                                val = float(getattr(p, 'value', 0))
-                                if ts > 0 or val > 0:  # Only add non-empty points
-                                    points.append([ts, val])
-                            except:
-                                pass  # Skip malformed points
-                    
-                    if points:  # Only add series if it has data
-                        series_list.append({"scope": scope, "points": points})
+        key = self._cache_key(query, from_timestamp, to_timestamp)
+        result = self._cache_get(key)
+        if result is None:
+            result = self._fetch_metrics(query, from_timestamp, to_timestamp)
+            if result["status"] == "success":
+                self._cache_put(key, result, to_timestamp)
+        return result
 
+    def _query_raw(
+        self,
+        query: str,
+        from_timestamp: int,
+        to_timestamp: int,
+    ) -> list[tuple[str, np.ndarray, np.ndarray]]:
+        """
+        Query Datadog directly, bypassing the cache, and return each series as
+        (scope, timestamps, values) numpy arrays. Raises on API errors.
+        """
+        self._acquire()
+        response = self.metrics_api.query_metrics(
+            _from=from_timestamp,
+            to=to_timestamp,
+            query=query,
+        )
+        return _series_arrays(response)
+
+    def _fetch_metrics(
+        self,
+        query: str,
+        from_timestamp: int,
+        to_timestamp: int,
+    ) -> dict[str, Any]:
+        """Query Datadog directly, bypassing the cache."""
+        try:
+            series = self._query_raw(query, from_timestamp, to_timestamp)
+            return _format_query_response(series, query, from_timestamp, to_timestamp)
+        except Exception as e:
+            logger.error(f"Failed to query metrics: {e}")
             return {
-                "status": "success",
+                "status": "error",
                 "query": query,
-                "from": from_timestamp,
-                "to": to_timestamp,
-                "series_count": len(series_list),
-                "series": series_list,
+                "error": str(e),
             }
+
+    async def query_metrics_async(
+        self,
+        query: str,
+        from_timestamp: int,
+        to_timestamp: int,
+    ) -> dict[str, Any]:
+        """
+        Async variant of query_metrics, for running several queries concurrently.
+
+        Calls the query API directly over a shared HTTP/2 connection (see
+        _raw_query) and shares the query_metrics cache.
+        """
+        key = self._cache_key(query, from_timestamp, to_timestamp)
+        if self.cache_enabled:
+            result = self._cache_get(key)
+            if result is not None:
+                return result
+
+        await self._acquire_async()
+        try:
+            response = await self._raw_query(query, from_timestamp, to_timestamp)
+            result = _format_query_response(
+                _series_arrays(response), query, from_timestamp, to_timestamp
+            )
         except Exception as e:
             logger.error(f"Failed to query metrics: {e}")
             return {
@@ -135,6 +466,43 @@ class DatadogMetricsClient:
                 "error": str(e),
             }
 
+        if self.cache_enabled:
+            self._cache_put(key, result, to_timestamp)
+        return result
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Create the HTTP/2 client on first use; it keeps its connections across batches."""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                base_url=self.config.host,
+                headers={"DD-API-KEY": self.api_key, "DD-APPLICATION-KEY": self.app_key},
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=20),
+                timeout=30.0,
+            )
+        return self._http_client
+
+    async def _raw_query(self, query: str, from_timestamp: int, to_timestamp: int) -> dict[str, Any]:
+        """
+        GET /api/v1/query without the SDK, so concurrent queries are multiplexed
+        as HTTP/2 streams over one connection.
+        """
+        response = await self._get_http_client().get(
+            "/api/v1/query",
+            params={"from": from_timestamp, "to": to_timestamp, "query": query},
+        )
+        response.raise_for_status()
+        payload = orjson.loads(response.content)
+        if payload.get("status") == "error":
+            raise RuntimeError(payload.get("error") or "query failed")
+        return payload
+
+    async def aclose(self) -> None:
+        """Close the batch HTTP/2 client, if one was created."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
     def search_metrics(self, prefix: str) -> dict[str, Any]:
         """
         Search for metrics matching a prefix.
@@ -143,39 +511,42 @@ class DatadogMetricsClient:
             prefix: Metric prefix to search (e.g., "aws.applicationelb")
 
         Returns:
-            Dictionary with matching metrics
+            Dictionary with up to SEARCH_METRICS_LIMIT matching metrics
         """
+        if not prefix or not prefix.strip():
+            # An empty query would list every metric in the account
+            return {
+                "status": "error",
+                "prefix": prefix,
+                "error": "prefix must not be empty",
+            }
+
+        self._acquire()
         try:
             response = self.metrics_api.list_metrics(q=prefix)
-            metrics = []
             
             # response.results is a MetricSearchResponseResults object
-            # Try to iterate or extract the data
-            if response.results:
-                try:
-                    # Try as iterable
-                    for m in response.results:
-                        name = getattr(m, 'name', str(m))
-                        if name:
-                            metrics.append(name)
-                except TypeError:
-                    # Try as object with direct attributes
-                    results_obj = response.results
-                    # Check if it has results attribute
-                    if hasattr(results_obj, 'results'):
-                        for m in results_obj.results:
-                            name = getattr(m, 'name', str(m))
-                            if name:
-                                metrics.append(name)
-                    else:
-                        # Try to convert to dict and extract
-                        logger.warning(f"Unexpected results format: {type(results_obj)}")
+            results = response.results
+            if not results or (
+                isinstance(results, MetricSearchResponseResults) and not results.get("metrics")
+            ):
+                return {
+                    "status": "success",
+                    "prefix": prefix,
+                    "count": 0,
+                    "metrics": [],
+                }
+
+            if self._metric_names is None:
+                self._metric_names = _metric_name_extractor(results)
+            # Stop extracting once we have the first SEARCH_METRICS_LIMIT
+            metrics = list(islice(self._metric_names(results), SEARCH_METRICS_LIMIT))
             
             return {
                 "status": "success",
                 "prefix": prefix,
                 "count": len(metrics),
-                "metrics": metrics[:50],  # Limit to first 50
+                "metrics": metrics,
             }
         except Exception as e:
             logger.error(f"Failed to search metrics: {e}")
@@ -225,89 +596,277 @@ class DatadogMetricsClient:
             from_timestamp: Start time (unix seconds)
             to_timestamp: End time (unix seconds)
             title: Chart title (optional)
-            format: Image format - 'png' or 'base64'
+            format: Image format - 'png', 'svg' or 'base64' (base64-encoded PNG)
 
         Returns:
             Dictionary with image data or base64 string
         """
-        try:
-            # Query metrics first
-            result = self.query_metrics(query, from_timestamp, to_timestamp)
-            
-            if result.get("status") != "success" or not result.get("series"):
+        # Reuse a cached query_metrics result if there is one; otherwise plot
+        # the decoded arrays directly rather than building the list form
+        cached = None
+        if self.cache_enabled:
+            cached = self._cache_get(self._cache_key(query, from_timestamp, to_timestamp))
+        if cached is not None:
+            series = cached["series"]
+        else:
+            try:
+                series = [
+                    {"scope": scope, "timestamps": timestamps, "values": values}
+                    for scope, timestamps, values in self._query_raw(query, from_timestamp, to_timestamp)
+                ]
+            except Exception as e:
+                logger.error(f"Failed to query metrics: {e}")
                 return {
                     "status": "error",
-                    "error": "No data available for the query"
-                }
-            
-            # Create figure
-            plt.figure(figsize=(12, 6))
-            
-            # Plot each series
-            for series in result["series"]:
-                timestamps = [p[0] for p in series["points"]]
-                values = [p[1] for p in series["points"]]
-                
-                # Convert timestamps to datetime
-                dates = [datetime.fromtimestamp(ts) for ts in timestamps]
-                
-                # Plot line
-                label = series["scope"] if series["scope"] else query
-                plt.plot(dates, values, marker='o', linestyle='-', linewidth=2, markersize=4, label=label)
-            
-            # Formatting
-            plt.xlabel('Time', fontsize=12)
-            plt.ylabel('Value', fontsize=12)
-            plt.title(title or query, fontsize=14, fontweight='bold')
-            plt.grid(True, alpha=0.3)
-            plt.legend(loc='best')
-            
-            # Format x-axis
-            plt.gcf().autofmt_xdate()
-            ax = plt.gca()
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d %H:%M'))
-            
-            plt.tight_layout()
-            
-            # Save to buffer
-            buf = io.BytesIO()
-            plt.savefig(buf, format='png', dpi=100, bbox_inches='tight')
-            buf.seek(0)
-            plt.close()
-            
-            if format == "base64":
-                # Return base64 encoded image
-                img_base64 = base64.b64encode(buf.read()).decode('utf-8')
-                return {
-                    "status": "success",
                     "query": query,
-                    "format": "base64",
-                    "image": img_base64,
-                    "mime_type": "image/png"
+                    "error": str(e),
                 }
-            else:
-                # Return raw bytes
-                return {
-                    "status": "success",
-                    "query": query,
-                    "format": "png",
-                    "image_bytes": buf.getvalue(),
-                    "mime_type": "image/png"
-                }
-                
-        except Exception as e:
-            logger.error(f"Failed to generate image: {e}")
+
+        if not series:
             return {
                 "status": "error",
+                "error": "No data available for the query"
+            }
+
+        return render_metric_chart(series, query, title, format)
+
+
+# =============================================================================
+# Chart Rendering
+# =============================================================================
+
+# Series longer than this are downsampled before plotting; matplotlib cost grows
+# with point count while a 12-inch chart can't show more detail anyway.
+CHART_DOWNSAMPLE_THRESHOLD = 1000
+CHART_MAX_POINTS = 500
+
+
+# Chart modules, imported on the first render (see _chart_modules)
+_mpl: Optional[SimpleNamespace] = None
+
+
+def _chart_modules() -> SimpleNamespace:
+    """
+    Import matplotlib and the image encoders on first use, so servers that
+    never render a chart skip their startup time and memory.
+    """
+    global _mpl
+    if _mpl is None:
+        os.environ.setdefault("MPLBACKEND", "Agg")  # Non-interactive backend, no GUI probing
+        import io
+        import matplotlib
+        matplotlib.rcParams['path.simplify_threshold'] = 1.0  # Drop sub-pixel path segments
+        import matplotlib.dates as mdates
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        # SIMD-accelerated base64 for chart images when available
+        try:
+            from pybase64 import b64encode_as_string
+        except ImportError:
+            import base64
+
+            def b64encode_as_string(data) -> str:
+                return base64.b64encode(data).decode('ascii')
+
+        _mpl = SimpleNamespace(
+            io=io,
+            mdates=mdates,
+            FigureCanvasAgg=FigureCanvasAgg,
+            Figure=Figure,
+            b64encode_as_string=b64encode_as_string,
+        )
+    return _mpl
+
+
+# One reusable Figure per thread (or process-pool worker), cleared between charts
+_chart_local = threading.local()
+
+
+def _chart_figure() -> "Figure":
+    """Return this thread's chart Figure, cleared and ready to draw on."""
+    fig = getattr(_chart_local, "figure", None)
+    if fig is None:
+        mpl = _chart_modules()
+        fig = mpl.Figure(figsize=(12, 6))
+        mpl.FigureCanvasAgg(fig)
+        _chart_local.figure = fig
+    else:
+        fig.clf()
+    return fig
+
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Returns the indices of `n_out` points (always including the first and
+    last) that best preserve the visual shape of the series.
+    """
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+
+    # n_out - 2 buckets spanning the interior points [1, n - 1)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = x[end:edges[i + 2]].mean()
+            next_y = y[end:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        # Pick the point forming the largest triangle with the previous pick
+        # and the next bucket's average
+        area = np.abs(
+            (x[a] - next_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (next_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+def render_metric_chart(
+    series: list[dict[str, Any]],
+    query: str,
+    title: str = None,
+    format: str = "png"
+) -> dict[str, Any]:
+    """
+    Render metric series into a chart image.
+
+    Lives at module level and draws on a per-thread Agg Figure (not pyplot's
+    global state) so it can run in a ProcessPoolExecutor worker. Series
+    longer than CHART_DOWNSAMPLE_THRESHOLD are reduced to CHART_MAX_POINTS
+    with LTTB first.
+
+    Args:
+        series: Series dicts as returned in query_metrics()["series"]; the
+            timestamps and values may also be numpy arrays
+        query: Datadog metric query (used for labels and the default title)
+        title: Chart title (optional)
+        format: Image format - 'png', 'svg' or 'base64' (base64-encoded PNG)
+
+    Returns:
+        Dictionary with image data or base64 string
+    """
+    try:
+        mpl = _chart_modules()
+        fig = _chart_figure()
+        ax = fig.add_subplot()
+        
+        columns = [
+            (np.asarray(s["timestamps"], dtype=np.float64), np.asarray(s["values"], dtype=np.float64))
+            for s in series
+        ]
+        
+        # Series from one query usually share a time axis; convert it once
+        shared_dates = None
+        if columns and all(np.array_equal(ts, columns[0][0]) for ts, _ in columns[1:]):
+            shared_dates = columns[0][0].astype(np.int64).astype('datetime64[s]')
+        
+        # Plot each series
+        for s, (timestamps, values) in zip(series, columns):
+            keep = None
+            if len(timestamps) > CHART_DOWNSAMPLE_THRESHOLD:
+                keep = _lttb_indices(timestamps, values, CHART_MAX_POINTS)
+                timestamps, values = timestamps[keep], values[keep]
+            
+            if shared_dates is not None:
+                dates = shared_dates if keep is None else shared_dates[keep]
+            else:
+                # Convert timestamps to datetime64 in one pass (matplotlib plots these natively)
+                dates = timestamps.astype(np.int64).astype('datetime64[s]')
+            
+            # Plot line
+            label = s["scope"] if s["scope"] else query
+            ax.plot(dates, values, marker='o', linestyle='-', linewidth=2, markersize=4, label=label)
+        
+        # Formatting
+        ax.set_xlabel('Time', fontsize=12)
+        ax.set_ylabel('Value', fontsize=12)
+        ax.set_title(title or query, fontsize=14, fontweight='bold')
+        ax.grid(True, alpha=0.3)
+        ax.legend(loc='best')
+        
+        # Format x-axis
+        fig.autofmt_xdate()
+        ax.xaxis.set_major_formatter(mpl.mdates.DateFormatter('%Y-%m-%d %H:%M'))
+        
+        fig.tight_layout()
+        
+        # Save to buffer; SVG skips rasterization entirely
+        image_format = "svg" if format == "svg" else "png"
+        buf = mpl.io.BytesIO()
+        fig.savefig(buf, format=image_format, dpi=90, bbox_inches='tight')
+        buf.seek(0)
+        
+        if format == "svg":
+            return {
+                "status": "success",
                 "query": query,
-                "error": str(e)
+                "format": "svg",
+                "image_bytes": buf.getvalue(),
+                "mime_type": "image/svg+xml"
             }
+        elif format == "base64":
+            # Return base64 encoded image (encoded straight from the buffer, no copy)
+            img_base64 = mpl.b64encode_as_string(buf.getbuffer())
+            return {
+                "status": "success",
+                "query": query,
+                "format": "base64",
+                "image": img_base64,
+                "mime_type": "image/png"
+            }
+        else:
+            # Return raw bytes
+            return {
+                "status": "success",
+                "query": query,
+                "format": "png",
+                "image_bytes": buf.getvalue(),
+                "mime_type": "image/png"
+            }
+            
+    except Exception as e:
+        logger.error(f"Failed to generate image: {e}")
+        return {
+            "status": "error",
+            "query": query,
+            "error": str(e)
+        }
 
 
 # =============================================================================
 # MCP Server Setup
 # =============================================================================
 
+def time_range(days_back: int) -> tuple[int, int]:
+    """
+    Return (from_ts, to_ts) covering the last `days_back` days, with to_ts
+    floored to the minute so repeated calls within a minute share cache entries.
+    """
+    to_ts = int(time.time()) // 60 * 60
+    return to_ts - days_back * 24 * 3600, to_ts
+
+
+# Tool results are compact JSON; indentation roughly triples large series payloads
+_TOOL_JSON_OPTIONS = orjson.OPT_INDENT_2 if os.getenv("MCP_PRETTY_JSON") == "1" else 0
+
+
+def _tool_json(result: dict[str, Any]) -> str:
+    """Serialize a tool result with orjson."""
+    return orjson.dumps(result, option=_TOOL_JSON_OPTIONS).decode()
+
+
 def create_mcp_server() -> FastMCP:
     """Create MCP server with Datadog tools."""
     
@@ -320,9 +879,22 @@ def create_mcp_server() -> FastMCP:
         raise ValueError("DD_API_KEY and DD_APP_KEY environment variables required")
 
     dd_client = DatadogMetricsClient(api_key, app_key, site)
+    @asynccontextmanager
+    async def lifespan(server: FastMCP):
+        """
+        Pre-connect to Datadog when the server starts; close the batch HTTP/2
+        client on the server's event loop at shutdown.
+        """
+        # Only when actually serving, so building the server (e.g. the Docker
+        # HEALTHCHECK) never touches the network
+        threading.Thread(target=dd_client.warm_up, daemon=True).start()
+        try:
+            yield
+        finally:
+            await dd_client.aclose()
 
     # Create MCP server
-    mcp = FastMCP("datadog-metrics-mcp")
+    mcp = FastMCP("datadog-metrics-mcp", lifespan=lifespan)
 
     # Register tools using decorators
     @mcp.tool()
@@ -335,16 +907,48 @@ def create_mcp_server() -> FastMCP:
         
         Args:
             query: Datadog metric query (e.g., 'sum:aws.applicationelb.httpcode_target_5xx{account_name:prod}' or 'avg:system.cpu{*}')
-            days_back: Number of days to look back (default: 7)
+            days_back: Number of days to look back (default: 7). The window
+                ends at the start of the current minute, so the newest data may
+                be up to 60 seconds old.
         
         Returns:
-            JSON string with series data and timestamps
+            JSON string with a "series" list; each series is
+            {"scope": str, "timestamps": [unix seconds, ...], "values": [float, ...]}
+            with timestamps[i] paired with values[i]
         """
-        to_ts = int(time.time())
-        from_ts = to_ts - days_back * 24 * 3600
+        from_ts, to_ts = time_range(days_back)
         
         result = dd_client.query_metrics(query, from_ts, to_ts)
-        return json.dumps(result, indent=2)
+        return _tool_json(result)
+
+    # Server-wide cap on concurrent Datadog requests, shared by all in-flight
+    # query_metrics_batch calls, so large or parallel batches don't burst the API
+    batch_semaphore = asyncio.Semaphore(8)
+
+    async def _query_one(query: str, from_ts: int, to_ts: int) -> dict[str, Any]:
+        async with batch_semaphore:
+            return await dd_client.query_metrics_async(query, from_ts, to_ts)
+
+    @mcp.tool()
+    async def query_metrics_batch(
+        queries: list[str],
+        days_back: int = 7,
+    ) -> str:
+        """
+        Query several Datadog metric queries concurrently over the same time range.
+        
+        Args:
+            queries: List of Datadog metric queries (e.g., ['avg:system.cpu.user{*}', 'avg:system.load.1{*}'])
+            days_back: Number of days to look back (default: 7), ending at the
+                start of the current minute
+        
+        Returns:
+            JSON string with one query_metrics result per query, in order
+        """
+        from_ts, to_ts = time_range(days_back)
+        
+        results = await asyncio.gather(*(_query_one(q, from_ts, to_ts) for q in queries))
+        return _tool_json({"status": "success", "count": len(results), "results": results})
 
     @mcp.tool()
     def search_metrics(prefix: str) -> str:
@@ -358,7 +962,7 @@ def create_mcp_server() -> FastMCP:
             JSON string with list of matching metrics
         """
         result = dd_client.search_metrics(prefix)
-        return json.dumps(result, indent=2)
+        return _tool_json(result)
 
     @mcp.tool()
     def get_metric_tags(metric_name: str) -> str:
@@ -372,7 +976,7 @@ def create_mcp_server() -> FastMCP:
             JSON string with tag information
         """
         result = dd_client.get_metric_tags(metric_name)
-        return json.dumps(result, indent=2)
+        return _tool_json(result)
 
     @mcp.tool()
     def generate_metric_chart(
@@ -385,20 +989,21 @@ def create_mcp_server() -> FastMCP:
         
         Args:
             query: Datadog metric query (e.g., 'avg:system.cpu.user{*}')
-            days_back: Number of days to look back (default: 7)
+            days_back: Number of days to look back (default: 7), ending at the
+                start of the current minute
             title: Chart title (optional, defaults to query)
         
         Returns:
             JSON string with base64-encoded PNG image
         """
-        to_ts = int(time.time())
-        from_ts = to_ts - days_back * 24 * 3600
+        from_ts, to_ts = time_range(days_back)
         
         result = dd_client.generate_metric_image(query, from_ts, to_ts, title, format="base64")
-        return json.dumps(result, indent=2)
+        return _tool_json(result)
 
     logger.info("✅ MCP Server created with tools:")
     logger.info("  - query_metrics: Query timeseries data")
+    logger.info("  - query_metrics_batch: Query several timeseries concurrently")
     logger.info("  - search_metrics: Search available metrics")
     logger.info("  - get_metric_tags: Get metric tag information")
     logger.info("  - generate_metric_chart: Generate PNG chart image")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for decoding Datadog pointlists (_point_arrays / _series_arrays).
+"""
+
+import os
+import sys
+
+import numpy as np
+import orjson
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from datadog_api_client import ApiClient, Configuration
+from datadog_api_client.v1.model.metrics_query_response import MetricsQueryResponse
+from datadog_api_client.v1.model.point import Point
+
+from mcp_datadog_server import _format_query_response, _point_arrays, _series_arrays
+
+# A /api/v1/query response: nulls, an empty (0, 0) point and a series with no points
+PAYLOAD = {
+    "status": "ok",
+    "query": "avg:system.cpu.user{*} by {host}",
+    "from_date": 1673001600000,
+    "to_date": 1673001780000,
+    "series": [
+        {
+            "scope": "host:web-1",
+            "metric": "system.cpu.user",
+            "pointlist": [
+                [1673001600000.0, 1.5],
+                [1673001660000.0, None],
+                [0, 0],
+                [1673001720000.0, 2.25],
+            ],
+        },
+        {"scope": "host:web-2", "metric": "system.cpu.user", "pointlist": []},
+        {"scope": "", "metric": "system.cpu.user", "pointlist": [[1673001600000.0, 7.0]]},
+    ],
+}
+
+EXPECTED = [
+    ("host:web-1", [1673001600, 1673001660, 1673001720], [1.5, 0.0, 2.25]),
+    ("", [1673001600], [7.0]),
+]
+
+
+def as_lists(decoded):
+    return [(scope, ts.tolist(), values.tolist()) for scope, ts, values in decoded]
+
+
+def sdk_response(payload):
+    """Deserialize a payload the way MetricsApi.query_metrics does."""
+    client = ApiClient(Configuration())
+    return client.deserialize(orjson.dumps(payload).decode(), (MetricsQueryResponse,), True)
+
+
+class TimestampValue:
+    def __init__(self, timestamp, value):
+        self.timestamp = timestamp
+        self.value = value
+
+
+def test_sdk_response_with_point_models():
+    response = sdk_response(PAYLOAD)
+    assert isinstance(response.series[0].pointlist[0], Point)
+    assert as_lists(_series_arrays(response)) == EXPECTED
+
+
+def test_raw_json_response():
+    # What _raw_query returns for the batch path
+    response = orjson.loads(orjson.dumps(PAYLOAD))
+    assert as_lists(_series_arrays(response)) == EXPECTED
+
+
+def test_empty_responses():
+    assert _series_arrays(sdk_response({"status": "ok", "series": []})) == []
+    assert _series_arrays({"status": "ok", "series": []}) == []
+    assert _series_arrays({"status": "ok"}) == []
+
+
+def test_timestamp_value_objects():
+    ts, values = _point_arrays([
+        TimestampValue(1673001600000, 1.0),
+        TimestampValue(1673001660000, None),
+        TimestampValue(1673001720000, "bad"),
+    ])
+    assert ts.tolist() == [1673001600000.0, 1673001660000.0, 1673001720000.0]
+    assert values[0] == 1.0
+    assert np.isnan(values[1:]).all()
+
+
+def test_ragged_and_mixed_pointlists():
+    ts, values = _point_arrays([
+        [1673001600000.0, 1.0],
+        [1673001660000.0],
+        [1673001720000.0, 3.0, "extra"],
+        TimestampValue(1673001780000, 4.0),
+    ])
+    assert ts[[0, 2, 3]].tolist() == [1673001600000.0, 1673001720000.0, 1673001780000.0]
+    assert values[[0, 2, 3]].tolist() == [1.0, 3.0, 4.0]
+    # The short pair is unreadable and decodes to NaN, later dropped as empty
+    assert np.isnan(ts[1]) and np.isnan(values[1])
+
+
+def test_format_query_response():
+    result = _format_query_response(_series_arrays(sdk_response(PAYLOAD)), "q", 0, 60)
+    assert result == {
+        "status": "success",
+        "query": "q",
+        "from": 0,
+        "to": 60,
+        "series_count": 2,
+        "series": [
+            {"scope": scope, "timestamps": ts, "values": values}
+            for scope, ts, values in EXPECTED
+        ],
+    }
+    # Plain Python types, ready for any JSON encoder
+    assert type(result["series"][0]["timestamps"][0]) is int
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for LTTB chart downsampling (_lttb_indices).
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from mcp_datadog_server import _lttb_indices
+
+
+def reference_lttb(x, y, n_out):
+    """Straightforward per-point LTTB (Steinarsson, 2013) to compare against."""
+    n = len(x)
+    every = (n - 2) / (n_out - 2)
+    picked = [0]
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_start = end
+        next_end = min(int((i + 2) * every) + 1, n)
+        if next_start < next_end and i < n_out - 3:
+            avg_x = sum(x[next_start:next_end]) / (next_end - next_start)
+            avg_y = sum(y[next_start:next_end]) / (next_end - next_start)
+        else:
+            avg_x, avg_y = x[n - 1], y[n - 1]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        picked.append(best)
+        a = best
+    picked.append(n - 1)
+    return picked
+
+
+def series(n, seed=0):
+    rng = np.random.default_rng(seed)
+    x = 1_700_000_000 + np.arange(n, dtype=np.float64) * 60
+    y = np.cumsum(rng.normal(size=n))
+    return x, y
+
+
+@pytest.mark.parametrize("n", [1001, 2500, 10007])
+def test_matches_reference(n):
+    x, y = series(n)
+    indices = _lttb_indices(x, y, 500)
+    assert indices.tolist() == reference_lttb(x.tolist(), y.tolist(), 500)
+
+
+@pytest.mark.parametrize("n", [1, 10, 500])
+def test_short_series_returned_whole(n):
+    x, y = series(n)
+    assert _lttb_indices(x, y, 500).tolist() == list(range(n))
+
+
+@pytest.mark.parametrize("n_out", [0, 1, 2])
+def test_too_few_output_points_returns_all(n_out):
+    x, y = series(50)
+    assert _lttb_indices(x, y, n_out).tolist() == list(range(50))
+
+
+@pytest.mark.parametrize("n, n_out", [(1001, 500), (2500, 3), (10007, 1000)])
+def test_keeps_endpoints_and_order(n, n_out):
+    x, y = series(n, seed=n)
+    indices = _lttb_indices(x, y, n_out)
+    assert len(indices) == n_out
+    assert indices[0] == 0
+    assert indices[-1] == n - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+def test_keeps_spike():
+    x, y = series(5000)
+    y[3210] = 1e6
+    assert 3210 in _lttb_indices(x, y, 100)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for the client-side Datadog rate limiter (TokenBucket).
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import mcp_datadog_server
+from mcp_datadog_server import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(mcp_datadog_server.time, "monotonic", clock)
+    return clock
+
+
+def test_burst_then_wait(clock):
+    bucket = TokenBucket(rpm=60)
+    # A full bucket covers rpm calls without waiting
+    assert [bucket._reserve(1) for _ in range(60)] == [0.0] * 60
+    # The next call waits one refill interval, the one after two
+    assert bucket._reserve(1) == pytest.approx(1.0)
+    assert bucket._reserve(1) == pytest.approx(2.0)
+
+
+def test_refills_over_time(clock):
+    bucket = TokenBucket(rpm=60)
+    for _ in range(60):
+        bucket._reserve(1)
+    clock.now += 5
+    assert [bucket._reserve(1) for _ in range(5)] == [0.0] * 5
+    assert bucket._reserve(1) == pytest.approx(1.0)
+
+
+def test_refill_capped_at_capacity(clock):
+    bucket = TokenBucket(rpm=60)
+    clock.now += 3600
+    assert [bucket._reserve(1) for _ in range(60)] == [0.0] * 60
+    assert bucket._reserve(1) > 0
+
+
+def test_acquire_sleeps_after_burst():
+    bucket = TokenBucket(rpm=600)  # 0.1 s per token
+    start = time.monotonic()
+    for _ in range(600):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.05
+    bucket.acquire()
+    assert 0.08 <= time.monotonic() - start < 0.3
+
+
+def test_acquire_threads_are_spaced():
+    bucket = TokenBucket(rpm=600)
+    for _ in range(600):
+        bucket.acquire()
+    start = time.monotonic()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # Three reservations queue behind each other: ~0.1 + 0.2 + 0.3 s, in parallel
+    assert 0.25 <= time.monotonic() - start < 0.6
+
+
+def test_acquire_async_waits_without_blocking_loop():
+    bucket = TokenBucket(rpm=600)
+    for _ in range(600):
+        bucket.acquire()
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticking = asyncio.create_task(ticker())
+        start = time.monotonic()
+        await asyncio.gather(*(bucket.acquire_async() for _ in range(2)))
+        elapsed = time.monotonic() - start
+        ticking.cancel()
+        return elapsed, ticks
+
+    elapsed, ticks = asyncio.run(main())
+    assert 0.15 <= elapsed < 0.5
+    assert ticks >= 5